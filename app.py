@@ -1,40 +1,15 @@
+import math
+import os
+
 import numpy as np
 import pandas as pd
 import streamlit as st
 
-st.set_page_config(page_title="Geriatrics Workforce Model", layout="wide")
-
-EXCEL_PATH = "staffing_model.xlsx"
-STAFF_SHEET = "Staff"
-
-# -----------------------------
-# LOAD & CLEAN DATA
-# -----------------------------
-df = pd.read_excel(EXCEL_PATH, sheet_name=STAFF_SHEET)
-df.columns = [str(c).strip() for c in df.columns]
+from staff_schema import EXCEL_PATH, NUMERIC_COLS, PARQUET_PATH, STAFF_SHEET
 
-if "staff_group" not in df.columns:
-    df = df.rename(columns={df.columns[0]: "staff_group"})
-
-df["staff_group"] = df["staff_group"].astype(str).str.strip()
-df = df[df["staff_group"].ne("")]
-df = df[df["staff_group"].ne("nan")]
-
-numeric_cols = [
-    "headcount", "base_WTE", "pattern_factor",
-    "days_factor", "leave_factor", "oncall_loss"
-]
-for col in numeric_cols:
-    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+st.set_page_config(page_title="Geriatrics Workforce Model", layout="wide")
 
-required = [
-    "staff_group", "headcount", "base_WTE",
-    "pattern_factor", "days_factor", "leave_factor", "oncall_loss"
-]
-missing = [c for c in required if c not in df.columns]
-if missing:
-    st.error(f"Missing columns in Staff sheet: {missing}")
-    st.stop()
+REQUIRED_COLS = ["staff_group"] + NUMERIC_COLS
 
 # -----------------------------
 # GRADE GROUPING (updated)
@@ -52,14 +27,117 @@ GRADE_MAP = {
     "GPST": "SHO-grade",
     "ACP": "ACP",
 }
-def grade_of(staff_group: str) -> str:
-    return GRADE_MAP.get(staff_group, "Other")
+GRADE_ORDER = ["Foundation-grade", "SHO-grade", "ACP", "Other"]
+
+# -----------------------------
+# LOAD & CLEAN DATA
+# -----------------------------
+def staff_source() -> str:
+    """
+    Prefer the Parquet export (much faster to read) when it is at least as new
+    as the workbook; otherwise fall back to the xlsx.
+    """
+    if os.path.exists(PARQUET_PATH) and os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(EXCEL_PATH):
+        return PARQUET_PATH
+    return EXCEL_PATH
+
+@st.cache_data(show_spinner=False)
+def load_staff(path: str, mtime: float) -> pd.DataFrame:
+    """
+    Read + clean the Staff sheet (from the xlsx or its Parquet export).
+
+    Cached across reruns so the workbook is only parsed once;
+    mtime is part of the cache key so edits to the file are picked up.
+    """
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_excel(path, sheet_name=STAFF_SHEET, engine="openpyxl")
+    df.columns = [str(c).strip() for c in df.columns]
+
+    if "staff_group" not in df.columns:
+        df = df.rename(columns={df.columns[0]: "staff_group"})
+
+    # Drop blank cells explicitly (astype(str) keeps NaN on newer pandas),
+    # then whitespace-only names once stripped
+    df = df.dropna(subset=["staff_group"])
+    df["staff_group"] = df["staff_group"].astype(str).str.strip()
+    df = df[df["staff_group"] != ""]
+
+    missing = [c for c in REQUIRED_COLS if c not in df.columns]
+    if missing:
+        st.error(f"Missing columns in Staff sheet: {missing}")
+        st.stop()
+
+    df[NUMERIC_COLS] = df[NUMERIC_COLS].apply(pd.to_numeric, errors="coerce").fillna(0)
+
+    # Headcounts and WTE factors are small numbers: int16 / float32 is plenty
+    # and halves the bytes every array op in recalc has to move
+    factor_cols = [c for c in NUMERIC_COLS if c != "headcount"]
+    df["headcount"] = df["headcount"].round().astype(np.int16)
+    df[factor_cols] = df[factor_cols].astype(np.float32)
+
+    # Small closed set of groups -> categorical, so per-group lookups in recalc
+    # are done once per category and gathered by code
+    df["staff_group"] = df["staff_group"].astype("category")
+
+    # Sorted once here so the sidebar and tables never need to re-sort
+    df = df.sort_values("staff_group").reset_index(drop=True)
+
+    return df
+
+@st.cache_resource(show_spinner=False)
+def staff_arrays(path: str, mtime: float) -> dict:
+    """
+    Struct-of-arrays view of the Staff sheet for the model code:
+      staff_group -> pd.Categorical (codes + categories)
+      numeric cols -> contiguous ndarrays (int16 headcount, float32 factors)
+
+    Plus everything that only changes with the workbook:
+      grade -> pd.Categorical over GRADE_ORDER (GRADE_MAP looked up once per
+               staff_group category, then gathered by code)
+      scheduled_establishment_WTE_per_person = base_WTE * pattern * days * leave
+      scheduled_ward_WTE_per_person = ... * (1 - oncall_loss)
+
+    Shared across reruns (cache_resource), so callers must not mutate it.
+    """
+    d = load_staff(path, mtime)
+    groups = d["staff_group"].array
+    out = {"staff_group": groups}
+    for col in NUMERIC_COLS:
+        out[col] = d[col].to_numpy()
+
+    # Trailing sentinel slot: a missing group (code -1) gathers "Other",
+    # not the last category's grade
+    grade_by_cat = np.array(
+        [GRADE_ORDER.index(GRADE_MAP.get(g, "Other")) for g in groups.categories]
+        + [GRADE_ORDER.index("Other")],
+        dtype=np.int8,
+    )
+    out["grade"] = pd.Categorical.from_codes(grade_by_cat[groups.codes], categories=GRADE_ORDER)
+
+    sched_est_pp = out["base_WTE"] * out["pattern_factor"] * out["days_factor"] * out["leave_factor"]
+    out["scheduled_establishment_WTE_per_person"] = sched_est_pp
+    out["scheduled_ward_WTE_per_person"] = sched_est_pp * (1 - out["oncall_loss"])
+    return out
+
+staff_path = staff_source()
+staff_mtime = os.path.getmtime(staff_path)
+df = load_staff(staff_path, staff_mtime)
 
 # -----------------------------
 # MODEL CALCULATION
 # -----------------------------
-def recalc(d, sickness_rate=0.05, dev_days_map=None):
+def recalc(staff, sickness_rate=0.05, dev_days_map=None, headcount=None):
     """
+    staff:
+      struct-of-arrays from staff_arrays(); the result is a dict of the same
+      shape (one array per column) with the derived columns added.
+
+    headcount:
+      optional per-row override (same order as staff); defaults to
+      staff["headcount"]. Lets the sidebar counts be applied without copying.
+
     scheduled_ward_WTE_per_person:
       planned ward-facing contribution per person (after leave + oncall_loss),
       but BEFORE sickness/dev (availability).
@@ -67,93 +145,147 @@ def recalc(d, sickness_rate=0.05, dev_days_map=None):
     availability_factor:
       probability-like multiplier from sickness + dev days.
 
-    ward_effective_WTE_per_person (mean):
-      scheduled_ward_WTE_per_person * availability_factor
+    ward_WTE_total_mean:
+      headcount * scheduled_ward_WTE_per_person * availability_factor
 
     oncall_WTE_lost (scheduled):
       how much establishment WTE is diverted into on-call (your "giving to on-call"),
       defined as scheduled_establishment_WTE_total * oncall_loss
       (i.e., BEFORE sickness/dev).
+
+    Only columns read downstream are returned; per-person establishment and
+    effective WTE stay local.
     """
     if dev_days_map is None:
         dev_days_map = {}
 
-    out = d.copy()
-    out["grade"] = out["staff_group"].map(grade_of)
-
-    # Dev days -> availability
-    out["dev_days"] = out["staff_group"].map(dev_days_map).fillna(0).astype(float)
-    out["dev_factor"] = out["dev_days"] / 260.0  # approx working days/year
+    if headcount is None:
+        headcount = staff["headcount"]
+    hc = np.asarray(headcount, dtype=np.float32)
+    oc = staff["oncall_loss"]
 
-    out["availability_factor"] = (1 - sickness_rate) * (1 - out["dev_factor"])
+    # Dev days -> availability (looked up per category, gathered by code;
+    # grade is already precomputed the same way in staff_arrays)
+    groups = staff["staff_group"]
+    # Trailing 0 is the sentinel for a missing group (code -1)
+    dev_lookup = np.array([dev_days_map.get(g, 0) for g in groups.categories] + [0], dtype=np.float32)
+    dev_days = dev_lookup[groups.codes]
+    dev_factor = dev_days / 260.0  # approx working days/year
+    availability = (1 - sickness_rate) * (1 - dev_factor)
 
-    # Planned ward-facing contribution per person (no sickness/dev)
-    out["scheduled_ward_WTE_per_person"] = (
-        out["base_WTE"]
-        * out["pattern_factor"]
-        * out["days_factor"]
-        * out["leave_factor"]
-        * (1 - out["oncall_loss"])
-    )
+    # Establishment WTE (scheduled, before on-call loss, before sickness/dev)
+    # and planned ward-facing contribution per person: both precomputed in
+    # staff_arrays, only headcount/availability vary per rerun
+    sched_est_total = hc * staff["scheduled_establishment_WTE_per_person"]
+    sched_ward_pp = staff["scheduled_ward_WTE_per_person"]
+
+    return {
+        **staff,
+        "headcount": headcount,
+        "dev_days": dev_days,
+        "availability_factor": availability,
+        "scheduled_ward_WTE_total": hc * sched_ward_pp,
+        # Mean ward-facing after availability
+        "ward_WTE_total_mean": hc * sched_ward_pp * availability,
+        # "Giving to on-call": scheduled WTE diverted by on-call loss assumption
+        # (clamping oc at 0 is the same as masking oc > 0, without the mask)
+        "oncall_WTE_lost": sched_est_total * np.maximum(oc, 0),
+    }
 
-    # Mean ward-facing after availability
-    out["ward_effective_WTE_per_person"] = (
-        out["scheduled_ward_WTE_per_person"] * out["availability_factor"]
-    )
+# -----------------------------
+# COVER: POOL MOMENTS + ANALYTIC ESTIMATE
+# -----------------------------
+def pool_moments(headcount, ward_wte_per_person, availability):
+    """
+    Mean and s.d. of the pooled available WTE per day, i.e. the sum over
+    people of scheduled_ward_WTE_per_person * Bernoulli(availability_factor),
+    computed per group without expanding to individuals.
+    """
+    n = np.maximum(np.round(np.asarray(headcount, dtype=np.float64)), 0.0)
+    w = np.asarray(ward_wte_per_person, dtype=np.float64)
+    p = np.clip(np.asarray(availability, dtype=np.float64), 0.0, 1.0)
+    mu = float((n * w) @ p)
+    sigma = math.sqrt(float((n * w * w) @ (p * (1 - p))))
+    return mu, sigma
+
+def analytic_cover(headcount, ward_wte_per_person, availability, required_wte: float):
+    """
+    Closed-form counterpart of simulate_cover under the normal approximation
+    (available ~ Normal(mu, sigma), z = (required - mu) / sigma):
+      p_meet = 1 - Phi(z)
+      expected_shortfall_per_day = sigma * phi(z) + (required - mu) * Phi(z)
 
-    out["scheduled_ward_WTE_total"] = out["headcount"] * out["scheduled_ward_WTE_per_person"]
-    out["ward_WTE_total_mean"] = out["headcount"] * out["ward_effective_WTE_per_person"]
+    Deterministic and needs no sim-days/seed.
 
-    # Establishment WTE (scheduled, before on-call loss, before sickness/dev)
-    out["scheduled_establishment_WTE_per_person"] = (
-        out["base_WTE"]
-        * out["pattern_factor"]
-        * out["days_factor"]
-        * out["leave_factor"]
-    )
-    out["scheduled_establishment_WTE_total"] = out["headcount"] * out["scheduled_establishment_WTE_per_person"]
+    Returns:
+      p_meet, expected_shortfall_per_day
+    """
+    mu, sigma = pool_moments(headcount, ward_wte_per_person, availability)
+    gap = float(required_wte) - mu
 
-    # "Giving to on-call": scheduled WTE diverted by on-call loss assumption
-    out["oncall_WTE_lost"] = (out["scheduled_establishment_WTE_total"] * out["oncall_loss"]).where(out["oncall_loss"] > 0, 0)
+    if sigma == 0.0:
+        return float(gap <= 0), max(gap, 0.0)
 
-    return out
+    z = gap / sigma
+    cdf = 0.5 * math.erfc(-z / math.sqrt(2))
+    pdf = math.exp(-0.5 * z * z) / math.sqrt(2 * math.pi)
+    return 1.0 - cdf, sigma * pdf + gap * cdf
 
 # -----------------------------
 # MONTE CARLO COVER SIMULATION
 # -----------------------------
-def simulate_cover(scenario_df: pd.DataFrame, required_wte: float, sim_days: int, seed: int = 1):
+# Days simulated per block: caps the presence matrix
+# at (SIM_BLOCK_DAYS, N) however large sim_days is
+SIM_BLOCK_DAYS = 4096
+
+def simulate_cover(
+    headcount: np.ndarray,
+    ward_wte_per_person: np.ndarray,
+    availability: np.ndarray,
+    required_wte: float,
+    sim_days: int,
+    seed: int = 1,
+):
     """
+    Takes only the per-group arrays it reads (headcount,
+    scheduled_ward_WTE_per_person, availability_factor).
+
     Builds an individual-level pool:
       each person contributes scheduled_ward_WTE_per_person if present that day,
       and is present with probability availability_factor.
 
     Returns:
-      p_meet, expected_shortfall_per_day, expected_locum_wte_days_per_year
+      p_meet, expected_shortfall_per_day
     """
     rng = np.random.default_rng(seed)
 
-    # Expand to individuals
-    weights = []
-    probs = []
-    for _, row in scenario_df.iterrows():
-        n = int(round(row["headcount"]))
-        if n <= 0:
-            continue
-        w = float(row["scheduled_ward_WTE_per_person"])
-        p = float(row["availability_factor"])
-        p = min(max(p, 0.0), 1.0)
-        weights.extend([w] * n)
-        probs.extend([p] * n)
-
-    if len(weights) == 0:
-        return 0.0, float(required_wte), float(required_wte) * 260.0
-
-    w = np.array(weights, dtype=float)          # (N,)
-    p = np.array(probs, dtype=float)            # (N,)
-
-    # Simulate presence matrix: (sim_days, N)
-    present = rng.random((sim_days, len(w))) < p
-    available_wte = present @ w  # (sim_days,)
+    # Expand to individuals: one entry per person, repeated per group
+    counts = np.round(np.asarray(headcount)).astype(np.int64)
+    keep = counts > 0
+    counts = counts[keep]
+    w = np.repeat(np.asarray(ward_wte_per_person, dtype=np.float64)[keep], counts)  # (N,)
+    p = np.repeat(np.clip(np.asarray(availability, dtype=np.float64)[keep], 0.0, 1.0), counts)  # (N,)
+
+    if w.size == 0:
+        return 0.0, float(required_wte)
+
+    # Simulate presence in blocks of days: (block, N) at a time.
+    # Blocks consume the RNG stream in the same order as one big matrix.
+    # One uniform + one presence buffer are allocated and refilled in place.
+    # float32 throughout: half the bytes of the dominant matrix, and the
+    # 0/1 presence @ w product runs as a single-precision BLAS matvec.
+    block = min(SIM_BLOCK_DAYS, sim_days)
+    w32 = w.astype(np.float32)
+    p32 = p.astype(np.float32)
+    uniform = np.empty((block, w.size), dtype=np.float32)
+    present = np.empty((block, w.size), dtype=np.float32)
+    available_wte = np.empty(sim_days)
+    for start in range(0, sim_days, block):
+        stop = min(start + block, sim_days)
+        u = uniform[:stop - start]
+        rng.random(dtype=np.float32, out=u)
+        np.less(u, p32, out=present[:stop - start])
+        available_wte[start:stop] = present[:stop - start] @ w32
 
     shortfall = np.maximum(0.0, required_wte - available_wte)
 
@@ -161,17 +293,92 @@ def simulate_cover(scenario_df: pd.DataFrame, required_wte: float, sim_days: int
     exp_shortfall_per_day = float(np.mean(shortfall))
     return p_meet, exp_shortfall_per_day
 
+# -----------------------------
+# SCENARIO PIPELINE (cached)
+# -----------------------------
+# recalc columns shown in the detail table (and bar chart); the cached
+# pipeline returns only these, not every intermediate array
+DETAIL_COLS = [
+    "grade", "staff_group", "headcount",
+    "leave_factor", "oncall_loss", "dev_days",
+    "availability_factor",
+    "scheduled_ward_WTE_total", "ward_WTE_total_mean",
+    "oncall_WTE_lost"
+]
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_scenario(
+    path: str,
+    mtime: float,
+    counts: tuple,
+    sickness_rate: float,
+    dev_items: tuple,
+    required_wte: float,
+    closed_form: bool,
+    sim_days: int,
+    seed: int,
+):
+    """
+    recalc -> per-grade sums -> cover estimate, keyed only on hashable
+    widget values (counts / dev_items are tuples in df row order / sorted),
+    so revisiting a previous setting is a cache hit.
+
+    Returns a small dict so cache hits only unpickle what the page uses:
+      detail: {col: array} for DETAIL_COLS
+      total_headcount, scheduled_ward_wte, mean_ward_wte, oncall_lost_total
+      hc_by_grade, oncall_lost_by_grade: arrays in GRADE_ORDER
+      p_meet, exp_shortfall_per_day
+    """
+    scenario = recalc(
+        staff_arrays(path, mtime),
+        sickness_rate=sickness_rate,
+        dev_days_map=dict(dev_items),
+        headcount=np.array(counts),
+    )
+
+    # Per-grade sums: grade codes index the fixed GRADE_ORDER buckets directly
+    grade_idx = scenario["grade"].codes
+    hc_by_grade = np.bincount(grade_idx, weights=scenario["headcount"], minlength=len(GRADE_ORDER))
+    oncall_lost_by_grade = np.bincount(grade_idx, weights=scenario["oncall_WTE_lost"], minlength=len(GRADE_ORDER))
+
+    cover_inputs = dict(
+        headcount=scenario["headcount"],
+        ward_wte_per_person=scenario["scheduled_ward_WTE_per_person"],
+        availability=scenario["availability_factor"],
+        required_wte=required_wte,
+    )
+    if closed_form:
+        p_meet, exp_shortfall_per_day = analytic_cover(**cover_inputs)
+    else:
+        p_meet, exp_shortfall_per_day = simulate_cover(**cover_inputs, sim_days=sim_days, seed=seed)
+
+    return {
+        "detail": {c: scenario[c] for c in DETAIL_COLS},
+        "total_headcount": float(scenario["headcount"].sum()),
+        "scheduled_ward_wte": float(scenario["scheduled_ward_WTE_total"].sum()),
+        "mean_ward_wte": float(scenario["ward_WTE_total_mean"].sum()),
+        "oncall_lost_total": float(scenario["oncall_WTE_lost"].sum()),
+        "hc_by_grade": hc_by_grade,
+        "oncall_lost_by_grade": oncall_lost_by_grade,
+        "p_meet": p_meet,
+        "exp_shortfall_per_day": exp_shortfall_per_day,
+    }
+
 # -----------------------------
 # SIDEBAR CONFIG
 # -----------------------------
 st.sidebar.header("Headcount Configuration")
-new_counts = {}
-for _, row in df.sort_values("staff_group").iterrows():
-    g = row["staff_group"]
-    new_counts[g] = st.sidebar.number_input(
-        g, min_value=0, max_value=200,
-        value=int(round(row["headcount"])), step=1
-    )
+edited_counts = st.sidebar.data_editor(
+    df[["staff_group", "headcount"]],
+    disabled=["staff_group"],
+    hide_index=True,
+    num_rows="fixed",
+    column_config={
+        "headcount": st.column_config.NumberColumn(min_value=0, max_value=200, step=1),
+    },
+)
+# num_rows="fixed" keeps the editor rows in df's row order, so counts line up positionally
+new_counts = edited_counts["headcount"].fillna(0).round().to_numpy(dtype=np.int64)
 
 st.sidebar.header("Assumptions")
 sickness_rate = st.sidebar.slider("Sickness allowance", 0.00, 0.15, 0.05, 0.01)
@@ -195,53 +402,60 @@ working_days_per_year = st.sidebar.number_input(
 )
 
 st.sidebar.header("Simulation")
-sim_days = st.sidebar.slider("Simulation days (more = smoother)", 2000, 50000, 20000, 2000)
-seed = st.sidebar.number_input("Random seed", min_value=1, max_value=9999, value=1, step=1)
+use_closed_form = st.sidebar.toggle(
+    "Closed-form estimate (normal approximation, no simulation)", value=False,
+    help="Instant and deterministic, but approximate for small pools.",
+)
+# Always rendered (just disabled) so their values survive toggling closed-form on and off
+sim_days = st.sidebar.slider(
+    "Simulation days (more = smoother)", 2000, 50000, 20000, 2000, disabled=use_closed_form
+)
+seed = st.sidebar.number_input(
+    "Random seed", min_value=1, max_value=9999, value=1, step=1, disabled=use_closed_form
+)
 
 # -----------------------------
 # APPLY CONFIG
 # -----------------------------
-df2 = df.copy()
-df2["headcount"] = df2["staff_group"].map(new_counts).fillna(0)
-
-scenario = recalc(df2, sickness_rate=sickness_rate, dev_days_map=dev_map)
+# Sidebar counts are already in df's row order; tuple makes them a hashable key
+headcount = tuple(new_counts.tolist())
+
+results = compute_scenario(
+    staff_path, staff_mtime,
+    counts=headcount,
+    sickness_rate=float(sickness_rate),
+    dev_items=tuple(sorted(dev_map.items())),
+    required_wte=float(required_staff_per_day),
+    closed_form=bool(use_closed_form),
+    sim_days=0 if use_closed_form else int(sim_days),
+    seed=0 if use_closed_form else int(seed),
+)
 
 # -----------------------------
 # SUMMARIES
 # -----------------------------
-total_headcount = float(scenario["headcount"].sum())
-scheduled_ward_wte = float(scenario["scheduled_ward_WTE_total"].sum())
-mean_ward_wte = float(scenario["ward_WTE_total_mean"].sum())
+scenario = results["detail"]
+total_headcount = results["total_headcount"]
+scheduled_ward_wte = results["scheduled_ward_wte"]
+mean_ward_wte = results["mean_ward_wte"]
+
+grade_index = pd.Index(GRADE_ORDER, name="grade")
+
+# Headcount by grade (still useful)
+hc_by_grade = pd.Series(results["hc_by_grade"], index=grade_index, name="headcount")
 
 # On-call WTE lost (overall + by grade)  ✅ user requested
-oncall_lost_by_grade = (
-    scenario.groupby("grade", dropna=False)["oncall_WTE_lost"]
-    .sum()
-    .reindex(["Foundation-grade", "SHO-grade", "ACP", "Other"])
-    .fillna(0)
-)
+oncall_lost_by_grade = pd.Series(results["oncall_lost_by_grade"], index=grade_index, name="oncall_WTE_lost")
 
 oncall_lost_foundation = float(oncall_lost_by_grade.get("Foundation-grade", 0.0))
 oncall_lost_sho = float(oncall_lost_by_grade.get("SHO-grade", 0.0))
-oncall_lost_total = float(scenario["oncall_WTE_lost"].sum())
+oncall_lost_total = results["oncall_lost_total"]
 
-# Cover simulation
-p_meet, exp_shortfall_per_day = simulate_cover(
-    scenario_df=scenario,
-    required_wte=float(required_staff_per_day),
-    sim_days=int(sim_days),
-    seed=int(seed)
-)
+# Cover estimate (Monte Carlo by default; closed form if toggled on)
+p_meet = results["p_meet"]
+exp_shortfall_per_day = results["exp_shortfall_per_day"]
 locum_wte_days_per_year = exp_shortfall_per_day * float(working_days_per_year)
 
-# Headcount by grade (still useful)
-hc_by_grade = (
-    scenario.groupby("grade", dropna=False)["headcount"]
-    .sum()
-    .reindex(["Foundation-grade", "SHO-grade", "ACP", "Other"])
-    .fillna(0)
-)
-
 # -----------------------------
 # OUTPUT
 # -----------------------------
@@ -258,10 +472,18 @@ k6.metric("WTE lost to on-call (total)", f"{oncall_lost_total:.2f}")
 k7.metric("WTE lost to on-call (Foundation)", f"{oncall_lost_foundation:.2f}")
 k8.metric("WTE lost to on-call (SHO)", f"{oncall_lost_sho:.2f}")
 
+if use_closed_form:
+    cover_note = (
+        "P(meet cover) and shortfall use a normal approximation to pooled availability (closed form, no simulation). "
+    )
+else:
+    cover_note = (
+        f"Per-person Monte Carlo over {sim_days} days (seed={seed}); increase sim-days if you want smoother locum estimates. "
+    )
 st.caption(
     f"Cover requirement is {required_staff_per_day:.0f} WTE-equivalent per weekday day (pooled across wards). "
-    f"Simulation uses {sim_days} days (seed={seed}); increase sim-days if you want smoother locum estimates. "
-    f"Locum estimate is expected shortfall per day × {working_days_per_year} weekday shifts/year."
+    + cover_note
+    + f"Locum estimate is expected shortfall per day × {working_days_per_year} weekday shifts/year."
 )
 
 st.divider()
@@ -286,17 +508,14 @@ with right:
 st.divider()
 
 st.subheader("Mean ward-facing WTE by staff group")
-plot_df = scenario[["staff_group", "ward_WTE_total_mean"]].copy()
-plot_df["staff_group"] = plot_df["staff_group"].astype(str)
-st.bar_chart(plot_df.set_index("staff_group")["ward_WTE_total_mean"])
+st.bar_chart(pd.Series(
+    scenario["ward_WTE_total_mean"],
+    index=pd.Index(scenario["staff_group"].astype(str), name="staff_group"),
+    name="ward_WTE_total_mean",
+))
 
 st.subheader("Detailed Workforce Table")
-detail = scenario[[
-    "grade", "staff_group", "headcount",
-    "leave_factor", "oncall_loss", "dev_days",
-    "availability_factor",
-    "scheduled_ward_WTE_total", "ward_WTE_total_mean",
-    "oncall_WTE_lost"
-]].sort_values(["grade", "staff_group"])
+# Categorical staff_group/grade go to the browser as dictionary-encoded Arrow columns
+detail = pd.DataFrame(scenario).sort_values(["grade", "staff_group"], kind="stable")
 
-st.dataframe(detail, use_container_width=True)
+st.dataframe(detail, use_container_width=True, hide_index=True)
@@ -0,0 +1,13 @@
+"""
+Workbook location and Staff sheet layout, shared by app.py and
+xlsx_to_parquet.py (app.py can't be imported without running Streamlit).
+"""
+
+EXCEL_PATH = "staffing_model.xlsx"
+PARQUET_PATH = "staffing_model.parquet"  # optional; see xlsx_to_parquet.py
+STAFF_SHEET = "Staff"
+
+NUMERIC_COLS = [
+    "headcount", "base_WTE", "pattern_factor",
+    "days_factor", "leave_factor", "oncall_loss"
+]
@@ -0,0 +1,22 @@
+"""
+One-off conversion of the Staff sheet to Parquet.
+
+    python xlsx_to_parquet.py
+
+app.py reads staffing_model.parquet instead of the workbook whenever the
+Parquet file is at least as new as the xlsx, so re-run this after editing
+the workbook (or just delete the .parquet to go back to the xlsx).
+"""
+import pandas as pd
+
+from staff_schema import EXCEL_PATH, NUMERIC_COLS, PARQUET_PATH, STAFF_SHEET
+
+df = pd.read_excel(EXCEL_PATH, sheet_name=STAFF_SHEET, engine="openpyxl")
+df.columns = [str(c).strip() for c in df.columns]
+
+# Text in a numeric column (e.g. "TBC") can't go into a numeric Arrow column;
+# coerce it to NaN here and leave the rest of the cleaning to load_staff
+present = [c for c in NUMERIC_COLS if c in df.columns]
+df[present] = df[present].apply(pd.to_numeric, errors="coerce")
+df.to_parquet(PARQUET_PATH, engine="pyarrow", compression="zstd", index=False)
+print(f"Wrote {len(df)} rows to {PARQUET_PATH}")